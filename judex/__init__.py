@@ -1,6 +1,18 @@
-from .core import JudexScraper
 from .exceptions import JudexScraperError, ValidationError
-from .spiders.stf import StfSpider
 
 __version__ = "1.0.0"
 __all__ = ["JudexScraper", "StfSpider", "JudexScraperError", "ValidationError"]
+
+
+def __getattr__(name: str):
+    # Scrapy-backed objects are imported on first access so light entry
+    # points (e.g. listing strategies) don't pay for Scrapy/Twisted
+    if name == "JudexScraper":
+        from .core import JudexScraper
+
+        return JudexScraper
+    if name == "StfSpider":
+        from .spiders.stf import StfSpider
+
+        return StfSpider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,7 +19,7 @@ class JudexScraper:
 
     Args:
         classe: The class of the process to scrape
-        processos: The processes to scrape
+        processos: The processes to scrape, as a list or a JSON list string
         scraper_kind: The kind of scraper to use
         output_path: The path to the output directory
         salvar_como: The persistence types to use
@@ -31,7 +31,7 @@ class JudexScraper:
     def __init__(
         self,
         classe: str,
-        processos: str,
+        processos: str | list[int],
         salvar_como: PersistenceTypes,
         scraper_kind: str = "stf",
         output_path: str = "judex_output",
@@ -73,11 +73,13 @@ class JudexScraper:
         self.spider = self._select_spider()
         self.select_persistence()
 
-    def _validate_inputs(self, processos: str, salvar_como: PersistenceTypes) -> None:
+    def _validate_inputs(
+        self, processos: str | list[int], salvar_como: PersistenceTypes
+    ) -> None:
         """Validate input parameters"""
-        if not isinstance(processos, str):
+        if not isinstance(processos, (str, list)):
             raise ValidationError(
-                "processos must be a string",
+                "processos must be a list or a JSON string",
                 field="processos",
                 value=type(processos).__name__,
             )
@@ -106,7 +108,7 @@ class JudexScraper:
             )
 
     def _parse_process_numbers(self) -> list | None:
-        """Parse process numbers from JSON string"""
+        """Parse process numbers, decoding them if given as a JSON string"""
         try:
             return (
                 json.loads(self.processos)
@@ -1,11 +1,29 @@
 import json
 import logging
 import sqlite3
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Statements are module constants so sqlite3's per-connection statement cache
+# reuses the prepared statement across processos
+_INSERT_PROCESSO_SQL = """
+    INSERT OR REPLACE INTO processos (
+        numero_unico, incidente, processo_id, classe, tipo_processo, liminar, relator,
+        origem, orgao_origem, data_protocolo, primeiro_autor, assuntos,
+        html, error_message, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_PARTES_SQL = "INSERT INTO partes (numero_unico, _index, tipo, nome) VALUES (?, ?, ?, ?)"
+_INSERT_ANDAMENTOS_SQL = "INSERT INTO andamentos (numero_unico, index_num, data, nome, complemento, julgador) VALUES (?, ?, ?, ?, ?, ?)"
+_INSERT_DECISOES_SQL = "INSERT INTO decisoes (numero_unico, index_num, data, nome, julgador, complemento, link) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_DESLOCAMENTOS_SQL = "INSERT INTO deslocamentos (numero_unico, index_num, data_enviado, data_recebido, enviado_por, recebido_por, guia) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_PETICOES_SQL = "INSERT INTO peticoes (numero_unico, index_num, data, tipo, autor, recebido_data, recebido_por) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_RECURSOS_SQL = "INSERT INTO recursos (numero_unico, index_num, data, nome, julgador, complemento, autor) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_PAUTAS_SQL = "INSERT INTO pautas (numero_unico, index_num, data, nome, complemento, relator) VALUES (?, ?, ?, ?, ?, ?)"
+
 
 def init_database(db_path: str):
     """Initialize the database with normalized tables"""
@@ -198,58 +216,74 @@ def init_database(db_path: str):
         conn.commit()
 
 
-def processo_write(db_path: str, processo_data: dict[str, Any]) -> bool:
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection for writing processos"""
+    return sqlite3.connect(db_path)
+
+
+def processo_write(db_path: str, processo_data: Mapping[str, Any]) -> bool:
     try:
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
+        conn = connect(db_path)
+    except Exception as e:
+        logger.error(f"Error saving case data: {str(e)}")
+        return False
+    try:
+        return processo_write_conn(conn, processo_data)
+    finally:
+        conn.close()
 
-            incidente = processo_data.get("incidente")
-            numero_unico = processo_data.get("numero_unico")
-            processo_id = processo_data.get("processo_id")
-            if not incidente or not numero_unico or not processo_id:
-                return False
 
-            # Save main processo data
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO processos (
-                    numero_unico, incidente, processo_id, classe, tipo_processo, liminar, relator,
-                    origem, orgao_origem, data_protocolo, primeiro_autor, assuntos,
-                    html, error_message, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    processo_data.get("numero_unico"),
-                    processo_data.get("incidente"),
-                    processo_data.get("processo_id"),
-                    processo_data.get("classe"),
-                    processo_data.get("tipo_processo"),
-                    processo_data.get("liminar"),
-                    processo_data.get("relator"),
-                    processo_data.get("origem"),
-                    processo_data.get("orgao_origem"),
-                    processo_data.get("data_protocolo"),
-                    processo_data.get("primeiro_autor"),
-                    json.dumps(processo_data.get("assuntos"), ensure_ascii=False),
-                    processo_data.get("html"),
-                    processo_data.get("error_message"),
-                    datetime.now().isoformat(),
-                ),
-            )
+def processo_write_conn(
+    conn: sqlite3.Connection, processo_data: Mapping[str, Any]
+) -> bool:
+    """Save a processo through an already open connection"""
+    try:
+        cursor = conn.cursor()
 
-            # Save normalized data to separate tables
-            _save_normalized_data(cursor, numero_unico, processo_data)
+        incidente = processo_data.get("incidente")
+        numero_unico = processo_data.get("numero_unico")
+        processo_id = processo_data.get("processo_id")
+        if not incidente or not numero_unico or not processo_id:
+            return False
 
-            conn.commit()
-            logger.info(f"Saved processo data for {numero_unico}")
-            return True
+        # Save main processo data
+        cursor.execute(
+            _INSERT_PROCESSO_SQL,
+            (
+                processo_data.get("numero_unico"),
+                processo_data.get("incidente"),
+                processo_data.get("processo_id"),
+                processo_data.get("classe"),
+                processo_data.get("tipo_processo"),
+                processo_data.get("liminar"),
+                processo_data.get("relator"),
+                processo_data.get("origem"),
+                processo_data.get("orgao_origem"),
+                processo_data.get("data_protocolo"),
+                processo_data.get("primeiro_autor"),
+                json.dumps(processo_data.get("assuntos"), ensure_ascii=False),
+                processo_data.get("html"),
+                processo_data.get("error_message"),
+                datetime.now().isoformat(),
+            ),
+        )
+
+        # Save normalized data to separate tables
+        _save_normalized_data(cursor, numero_unico, processo_data)
+
+        conn.commit()
+        logger.info(f"Saved processo data for {numero_unico}")
+        return True
 
     except Exception as e:
+        conn.rollback()
         logger.error(f"Error saving case data: {str(e)}")
         return False
 
 
-def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, Any]):
+def _save_normalized_data(
+    cursor, numero_unico: str, processo_data: Mapping[str, Any]
+):
     """Save JSON data to normalized tables"""
 
     # Clear existing data for this processo
@@ -263,17 +297,19 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
 
     # Save partes
     partes_data = processo_data.get("partes_total", [])
-    for parte in partes_data:
-        cursor.execute(
-            "INSERT INTO partes (numero_unico, _index, tipo, nome) VALUES (?, ?, ?, ?)",
-            (numero_unico, parte.get("_index"), parte.get("tipo"), parte.get("nome")),
-        )
+    cursor.executemany(
+        _INSERT_PARTES_SQL,
+        (
+            (numero_unico, parte.get("_index"), parte.get("tipo"), parte.get("nome"))
+            for parte in partes_data
+        ),
+    )
 
     # Save andamentos
     andamentos_data = processo_data.get("andamentos", [])
-    for andamento in andamentos_data:
-        cursor.execute(
-            "INSERT INTO andamentos (numero_unico, index_num, data, nome, complemento, julgador) VALUES (?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        _INSERT_ANDAMENTOS_SQL,
+        (
             (
                 numero_unico,
                 andamento.get("index"),
@@ -281,14 +317,16 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
                 andamento.get("nome"),
                 andamento.get("complemento"),
                 andamento.get("julgador"),
-            ),
-        )
+            )
+            for andamento in andamentos_data
+        ),
+    )
 
     # Save decisoes
     decisoes_data = processo_data.get("decisoes", [])
-    for decisao in decisoes_data:
-        cursor.execute(
-            "INSERT INTO decisoes (numero_unico, index_num, data, nome, julgador, complemento, link) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        _INSERT_DECISOES_SQL,
+        (
             (
                 numero_unico,
                 decisao.get("index"),
@@ -297,14 +335,16 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
                 decisao.get("julgador"),
                 decisao.get("complemento"),
                 decisao.get("link"),
-            ),
-        )
+            )
+            for decisao in decisoes_data
+        ),
+    )
 
     # Save deslocamentos
     deslocamentos_data = processo_data.get("deslocamentos", [])
-    for deslocamento in deslocamentos_data:
-        cursor.execute(
-            "INSERT INTO deslocamentos (numero_unico, index_num, data_enviado, data_recebido, enviado_por, recebido_por, guia) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        _INSERT_DESLOCAMENTOS_SQL,
+        (
             (
                 numero_unico,
                 deslocamento.get("index"),
@@ -313,14 +353,16 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
                 deslocamento.get("enviado_por"),
                 deslocamento.get("recebido_por"),
                 deslocamento.get("guia"),
-            ),
-        )
+            )
+            for deslocamento in deslocamentos_data
+        ),
+    )
 
     # Save peticoes
     peticoes_data = processo_data.get("peticoes", [])
-    for peticao in peticoes_data:
-        cursor.execute(
-            "INSERT INTO peticoes (numero_unico, index_num, data, tipo, autor, recebido_data, recebido_por) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        _INSERT_PETICOES_SQL,
+        (
             (
                 numero_unico,
                 peticao.get("index"),
@@ -329,14 +371,16 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
                 peticao.get("autor"),
                 peticao.get("recebido_data"),
                 peticao.get("recebido_por"),
-            ),
-        )
+            )
+            for peticao in peticoes_data
+        ),
+    )
 
     # Save recursos
     recursos_data = processo_data.get("recursos", [])
-    for recurso in recursos_data:
-        cursor.execute(
-            "INSERT INTO recursos (numero_unico, index_num, data, nome, julgador, complemento, autor) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        _INSERT_RECURSOS_SQL,
+        (
             (
                 numero_unico,
                 recurso.get("index"),
@@ -345,14 +389,16 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
                 recurso.get("julgador"),
                 recurso.get("complemento"),
                 recurso.get("autor"),
-            ),
-        )
+            )
+            for recurso in recursos_data
+        ),
+    )
 
     # Save pautas
     pautas_data = processo_data.get("pautas", [])
-    for pauta in pautas_data:
-        cursor.execute(
-            "INSERT INTO pautas (numero_unico, index_num, data, nome, complemento, relator) VALUES (?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        _INSERT_PAUTAS_SQL,
+        (
             (
                 numero_unico,
                 pauta.get("index"),
@@ -360,8 +406,10 @@ def _save_normalized_data(cursor, numero_unico: str, processo_data: dict[str, An
                 pauta.get("nome"),
                 pauta.get("complemento"),
                 pauta.get("relator"),
-            ),
-        )
+            )
+            for pauta in pautas_data
+        ),
+    )
 
 
 def mark_error(db_path: str, numero_unico: int, error_message: str) -> bool:
@@ -493,6 +541,33 @@ def get_failed_processo_ids(
         return set()
 
 
+def get_processo_states(
+    db_path: str, classe: str, max_age_hours: int = 24
+) -> tuple[set[int], set[int]]:
+    """Get (existing, failed) recent processo_ids for a classe in one query"""
+    try:
+        with sqlite3.connect(db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                f"""
+                SELECT processo_id, error_message IS NOT NULL FROM processos
+                WHERE classe = ?
+                AND created_at > datetime('now', '-{max_age_hours} hours')
+                """,
+                (classe,),
+            )
+
+            existing, failed = set(), set()
+            for processo_id, has_error in cursor.fetchall():
+                (failed if has_error else existing).add(processo_id)
+            return existing, failed
+
+    except Exception as e:
+        logger.error(f"Error getting processo states: {str(e)}")
+        return set(), set()
+
+
 # Helper functions for querying normalized data
 
 
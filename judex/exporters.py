@@ -1,15 +1,26 @@
 import csv
+from collections.abc import Iterable
 from typing import Any
 
 
-def export_to_csv(data: list[dict[str, Any]], filename: str) -> bool:
-    """Export data to a CSV file"""
+def export_to_csv(data: Iterable[dict[str, Any]], filename: str) -> bool:
+    """Export data to a CSV file, streaming rows from any iterable"""
     try:
-        with open(filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(data[0].keys())
-            for row in data:
-                writer.writerow(row.values())
+        rows = iter(data)
+        first = next(rows, None)
+        with open(
+            filename, "w", encoding="utf-8", newline="", buffering=64 * 1024
+        ) as f:
+            if first is None:
+                return True
+            # Header comes from the first row; later extra keys are dropped and
+            # missing ones left empty
+            writer = csv.DictWriter(
+                f, fieldnames=list(first.keys()), extrasaction="ignore", restval=""
+            )
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(rows)
         return True
     except Exception as e:
         print(f"Error exporting to CSV: {str(e)}")
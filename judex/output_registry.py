@@ -6,6 +6,20 @@ import os
 from typing import Any, Dict, Optional
 
 
+def output_base_name(
+    classe: str,
+    custom_name: Optional[str] = None,
+    process_numbers: Optional[list] = None,
+) -> str:
+    """File name (without extension) shared by all output formats of a run"""
+    if custom_name:
+        return custom_name
+    if process_numbers:
+        process_str = "_".join(map(str, process_numbers))
+        return f"{classe}_{process_str}"
+    return f"{classe}_processos"
+
+
 class OutputFormatRegistry:
     """Registry for output formats and their configurations"""
 
@@ -66,16 +80,7 @@ class OutputFormatRegistry:
         if not config or not config.get("pipeline"):
             return {}
 
-        # Generate filename
-        if custom_name:
-            base_name = custom_name
-        else:
-            if process_numbers:
-                process_str = "_".join(map(str, process_numbers))
-                base_name = f"{classe}_{process_str}"
-            else:
-                base_name = f"{classe}_processos"
-
+        base_name = output_base_name(classe, custom_name, process_numbers)
         file_path = os.path.join(output_path, f"{base_name}.{config['extension']}")
 
         return {
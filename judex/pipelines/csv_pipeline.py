@@ -2,6 +2,8 @@ import os
 
 from scrapy.exporters import CsvItemExporter
 
+from ..output_registry import output_base_name
+
 
 class CsvPipeline:
     """Pipeline to save scraped items to CSV file"""
@@ -33,23 +35,16 @@ class CsvPipeline:
         )
 
     def open_spider(self, spider):
-        # Generate filename
-        if self.custom_name:
-            base_name = self.custom_name
-        else:
-            if self.process_numbers:
-                process_str = "_".join(map(str, self.process_numbers))
-                base_name = f"{self.classe}_{process_str}"
-            else:
-                base_name = f"{self.classe}_processos"
-
+        base_name = output_base_name(
+            self.classe, self.custom_name, self.process_numbers
+        )
         file_path = os.path.join(self.output_path, f"{base_name}.csv")
 
         # Handle overwrite
         if self.overwrite and os.path.exists(file_path):
             os.remove(file_path)
 
-        self.file = open(file_path, "wb")
+        self.file = open(file_path, "wb", buffering=64 * 1024)
         self.exporter = CsvItemExporter(
             self.file, encoding="utf-8", include_headers_line=True
         )
@@ -3,7 +3,7 @@ import logging
 import scrapy
 from itemadapter import ItemAdapter
 
-from ..database import init_database, processo_write
+from ..database import connect, init_database, processo_write, processo_write_conn
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,7 @@ class DatabasePipeline:
 
     def __init__(self, db_path):
         self.db_path = db_path
+        self.conn = None
         init_database(db_path)
         logger.info(f"Database pipeline initialized with path: {db_path}")
 
@@ -22,19 +23,31 @@ class DatabasePipeline:
         db_path = crawler.settings.get("DATABASE_PATH", "judex.db")
         return cls(db_path)
 
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        """Keep one connection open for the whole crawl"""
+        self.conn = connect(self.db_path)
+
+    def close_spider(self, spider: scrapy.Spider) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
     def process_item(self, item, spider: scrapy.Spider) -> ItemAdapter:
         """Process each item and save to database"""
+        # ItemAdapter is already a mapping, so it is passed on without a copy
         adapter = ItemAdapter(item)
-        item_dict = dict(adapter)
-        success = processo_write(self.db_path, item_dict)
+        if self.conn is not None:
+            success = processo_write_conn(self.conn, adapter)
+        else:
+            success = processo_write(self.db_path, adapter)
 
         if success:
             logger.info(
-                f"Saved item to database: {item_dict.get('numero_unico', 'unknown')}"
+                f"Saved item to database: {adapter.get('numero_unico', 'unknown')}"
             )
         else:
             logger.error(
-                f"Failed to save item to database: {item_dict.get('numero_unico', 'unknown')}"
+                f"Failed to save item to database: {adapter.get('numero_unico', 'unknown')}"
             )
 
         return item
@@ -2,6 +2,30 @@ import os
 
 from scrapy.exporters import JsonItemExporter
 
+from ..exceptions import ValidationError
+from ..output_registry import output_base_name
+
+
+def _indent_setting(settings):
+    """Read JSON_INDENT, where None (or "None"/"" from `-s`) means compact"""
+    # settings.get() swaps an explicit None for the default
+    if "JSON_INDENT" not in settings:
+        return 2
+    value = settings["JSON_INDENT"]
+    if isinstance(value, str):
+        value = value.strip()
+        if value in ("", "None"):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError(
+                "JSON_INDENT must be an integer, None or empty",
+                field="JSON_INDENT",
+                value=value,
+            ) from None
+    return value
+
 
 class JsonPipeline:
     """Pipeline to save scraped items to JSON file"""
@@ -13,12 +37,14 @@ class JsonPipeline:
         custom_name=None,
         process_numbers=None,
         overwrite=True,
+        indent=2,
     ):
         self.output_path = output_path
         self.classe = classe
         self.custom_name = custom_name
         self.process_numbers = process_numbers
         self.overwrite = overwrite
+        self.indent = indent
         self.file = None
         self.exporter = None
 
@@ -30,28 +56,28 @@ class JsonPipeline:
             custom_name=crawler.settings.get("CUSTOM_NAME"),
             process_numbers=crawler.settings.get("PROCESS_NUMBERS"),
             overwrite=crawler.settings.get("OVERWRITE", True),
+            indent=_indent_setting(crawler.settings),
         )
 
     def open_spider(self, spider):
-        # Generate filename
-        if self.custom_name:
-            base_name = self.custom_name
-        else:
-            if self.process_numbers:
-                process_str = "_".join(map(str, self.process_numbers))
-                base_name = f"{self.classe}_{process_str}"
-            else:
-                base_name = f"{self.classe}_processos"
-
+        base_name = output_base_name(
+            self.classe, self.custom_name, self.process_numbers
+        )
         file_path = os.path.join(self.output_path, f"{base_name}.json")
 
         # Handle overwrite
         if self.overwrite and os.path.exists(file_path):
             os.remove(file_path)
 
-        self.file = open(file_path, "wb")
+        self.file = open(file_path, "wb", buffering=64 * 1024)
+        # Without indentation, drop the spaces json adds after separators too
+        separators = (",", ":") if self.indent is None else None
         self.exporter = JsonItemExporter(
-            self.file, indent=2, ensure_ascii=False, export_empty_fields=True
+            self.file,
+            indent=self.indent,
+            separators=separators,
+            ensure_ascii=False,
+            export_empty_fields=True,
         )
         self.exporter.start_exporting()
 
@@ -12,6 +12,8 @@ from .models import STFCaseModel
 
 logger = logging.getLogger(__name__)
 
+METADATA_FIELDS = frozenset({"_spider_name", "_scraped_at", "_item_count"})
+
 
 class PydanticValidationPipeline:
     """Pipeline to validate scraped data with Pydantic models"""
@@ -22,12 +24,11 @@ class PydanticValidationPipeline:
         item_dict = dict(adapter)
 
         # Filter out metadata fields before validation
-        metadata_fields = {"_spider_name", "_scraped_at", "_item_count"}
-        filtered_dict = {k: v for k, v in item_dict.items() if k not in metadata_fields}
+        filtered_dict = {k: v for k, v in item_dict.items() if k not in METADATA_FIELDS}
 
         try:
-            # Validate with Pydantic model
-            validated_item = STFCaseModel(**filtered_dict)
+            # Validate with the model's prebuilt core validator, no kwargs unpacking
+            validated_item = STFCaseModel.model_validate(filtered_dict)
 
             # Convert back to dict and update the item with validated data
             validated_dict = validated_item.model_dump()
@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from shutil import which
 
 BOT_NAME = "judex"
@@ -25,6 +26,11 @@ DOWNLOADER_MIDDLEWARES = {
     "scrapy_selenium.SeleniumMiddleware": 800,
 }
 
+TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+# uvloop (from the "fast" extra) drives the asyncio reactor when installed
+if find_spec("uvloop") is not None:
+    ASYNCIO_EVENT_LOOP = "uvloop.Loop"
+
 # EXTENSIONS = {
 #    'scrapy.extensions.telnet.TelnetConsole': None,
 # }
@@ -37,6 +43,8 @@ ITEM_PIPELINES = {
 }
 
 JSON_OUTPUT_FILE = "data.json"
+# None writes compact JSON (no newlines or spaces between tokens)
+JSON_INDENT = 2
 CSV_OUTPUT_FILE = "data.csv"
 DATABASE_PATH = "judex.db"
 
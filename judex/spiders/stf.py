@@ -1,5 +1,6 @@
 import datetime
 import json
+import re
 import time
 from collections.abc import AsyncGenerator, Iterator
 
@@ -7,12 +8,14 @@ import scrapy
 from bs4 import BeautifulSoup
 from scrapy.http import Response
 from scrapy_selenium import SeleniumRequest
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
-from judex.database import get_existing_processo_ids, get_failed_processo_ids
+from judex.database import get_processo_states
 from judex.extract import (
     extract_andamentos,
     extract_assuntos,
@@ -39,6 +42,19 @@ from judex.items import STFCaseItem
 from judex.types import validate_case_type
 from judex.utils.text import normalize_spaces
 
+try:
+    import orjson
+except ImportError:  # optional C parser from the "fast" extra
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Markers of pages we can't parse; one scan of the source instead of three
+_ERROR_PAGE_RE = re.compile(r"CAPTCHA|403 Forbidden|502 Bad Gateway")
+
+# Hidden input carrying the incidente id; stable enough to read without a DOM
+_INCIDENTE_RE = re.compile(r'<input[^>]*\bid="incidente"[^>]*\bvalue="(\d+)"')
+
 
 class StfSpider(scrapy.Spider):
     """
@@ -46,7 +62,8 @@ class StfSpider(scrapy.Spider):
 
     Args:
         classe: A classe dos processos, ex: 'ADI'.
-        processos: Uma lista JSON de números de processos, ex: '[4916, 4917]'.
+        processos: Uma lista de números de processos, ou a lista em JSON,
+            ex: '[4916, 4917]'.
 
     Exemplo:
         scrapy crawl stf -a classe='ADI' -a processos='[4436, 8000]'
@@ -58,7 +75,7 @@ class StfSpider(scrapy.Spider):
     def __init__(
         self,
         classe: str,
-        processos: str,
+        processos: str | list[int],
         internal_delay: float = 1.0,
         skip_existing: bool = True,
         retry_failed: bool = True,
@@ -82,12 +99,15 @@ class StfSpider(scrapy.Spider):
         if not processos:
             raise ValueError("processos is required, e.g., -a processos='[4916]'")
 
-        try:
-            self.numeros = json.loads(processos)
-        except Exception as e:
-            raise ValueError(
-                "processos must be a JSON list, e.g., '[4916, 4917]'"
-            ) from e
+        if isinstance(processos, list):
+            self.numeros = processos
+        else:
+            try:
+                self.numeros = _loads(processos)
+            except Exception as e:
+                raise ValueError(
+                    "processos must be a JSON list, e.g., '[4916, 4917]'"
+                ) from e
 
     def _filter_processos_by_database(self, db_path: str) -> tuple[list, int]:
         """
@@ -105,18 +125,14 @@ class StfSpider(scrapy.Spider):
 
         if self.skip_existing or self.retry_failed:
             try:
+                existing_ids, failed_ids = get_processo_states(
+                    db_path, self.classe, self.max_age_hours
+                )
                 if self.skip_existing:
-                    existing_ids = get_existing_processo_ids(
-                        db_path, self.classe, self.max_age_hours
-                    )
                     self.logger.info(
                         f"Found {len(existing_ids)} existing processo IDs to skip"
                     )
-
                 if self.retry_failed:
-                    failed_ids = get_failed_processo_ids(
-                        db_path, self.classe, self.max_age_hours
-                    )
                     self.logger.info(
                         f"Found {len(failed_ids)} failed processo IDs to retry"
                     )
@@ -167,49 +183,57 @@ class StfSpider(scrapy.Spider):
                 wait_until=EC.presence_of_element_located((By.ID, "conteudo")),
             )
 
+    def _find_element(self, driver: WebDriver, by: str, value: str) -> WebElement:
+        """Look the element up directly; poll only if it isn't rendered yet"""
+        try:
+            return driver.find_element(by, value)
+        except NoSuchElementException:
+            Wait = WebDriverWait(driver, 40)
+            return Wait.until(EC.presence_of_element_located((by, value)))
+
     def get_element_by_id(self, driver: WebDriver, id: str) -> str:
         time.sleep(self.internal_delay)
-        Wait = WebDriverWait(driver, 40)
-        Wait.until(EC.presence_of_element_located((By.ID, id)))
-        return driver.find_element(By.ID, id).get_attribute("value")
+        return self._find_element(driver, By.ID, id).get_attribute("value")
 
     def get_element_by_xpath(self, driver: WebDriver, xpath: str) -> str:
         time.sleep(self.internal_delay)
-        Wait = WebDriverWait(driver, 40)
-        Wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-        return driver.find_element(By.XPATH, xpath).get_attribute("innerHTML")
+        return self._find_element(driver, By.XPATH, xpath).get_attribute("innerHTML")
 
     def clean_text(self, html_text: str) -> str | None:
         """Clean HTML text by removing extra whitespace and HTML entities"""
         if not html_text:
             return None
 
-        soup = BeautifulSoup(html_text, "html.parser")
-        text = soup.get_text()
-        text = " ".join(text.split())
+        # Most callers pass element.text, which has no markup left to parse
+        if "<" in html_text or "&" in html_text:
+            html_text = BeautifulSoup(html_text, "html.parser").get_text()
+        text = " ".join(html_text.split())
         return text if text else None
 
     def parse_main_page_selenium(self, response: Response) -> Iterator[STFCaseItem]:
         driver = response.request.meta["driver"]  # type: ignore
         page_html = driver.page_source
-        soup = BeautifulSoup(page_html, "html.parser")
 
-        if "CAPTCHA" in driver.page_source:
-            self.logger.error(f"CAPTCHA detected in {response.url}")
-            return
-        if "403 Forbidden" in driver.page_source:
-            self.logger.error(f"403 Forbidden detected in {response.url}")
-            return
-        if "502 Bad Gateway" in driver.page_source:
-            self.logger.error(f"502 Bad Gateway detected in {response.url}")
+        error = _ERROR_PAGE_RE.search(page_html)
+        if error:
+            self.logger.error(f"{error.group(0)} detected in {response.url}")
             return
 
         # NON NULL
-        incidente = int(self.get_element_by_id(driver, "incidente"))
+        # Read the hidden input straight from the page source; fall back to
+        # Selenium only when the markup doesn't match
+        match = _INCIDENTE_RE.search(page_html)
+        if match:
+            incidente = int(match.group(1))
+        else:
+            incidente = int(self.get_element_by_id(driver, "incidente"))
         if not incidente:
             self.logger.error(f"Could not extract incidente number from {response.url}")
             return
 
+        # Only pages we are going to extract from get parsed
+        soup = BeautifulSoup(page_html, "html.parser")
+
         # Track overall extraction timing
         extraction_start_time = time.time()
 
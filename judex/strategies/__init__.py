@@ -3,11 +3,10 @@ Spider strategy pattern for judex
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
-from scrapy.spiders import Spider
-
-from ..spiders.stf import StfSpider
+if TYPE_CHECKING:
+    from scrapy.spiders import Spider
 
 
 class SpiderStrategy(ABC):
@@ -17,12 +16,12 @@ class SpiderStrategy(ABC):
     def create_spider(
         self,
         classe: str,
-        processos: str,
+        processos: str | list[int],
         skip_existing: bool = True,
         retry_failed: bool = True,
         max_age_hours: int = 24,
         **kwargs,
-    ) -> Spider:
+    ) -> "Spider":
         """Create and configure a spider instance"""
         pass
 
@@ -37,7 +36,7 @@ class SpiderStrategy(ABC):
         pass
 
     @abstractmethod
-    def validate_inputs(self, classe: str, processos: str) -> None:
+    def validate_inputs(self, classe: str, processos: str | list[int]) -> None:
         """Validate inputs specific to this strategy"""
         pass
 
@@ -48,13 +47,15 @@ class StfSpiderStrategy(SpiderStrategy):
     def create_spider(
         self,
         classe: str,
-        processos: str,
+        processos: str | list[int],
         skip_existing: bool = True,
         retry_failed: bool = True,
         max_age_hours: int = 24,
         **kwargs,
-    ) -> Spider:
+    ) -> "Spider":
         """Create and configure STF spider instance"""
+        from ..spiders.stf import StfSpider
+
         return StfSpider(
             classe=classe,
             processos=processos,
@@ -72,7 +73,7 @@ class StfSpiderStrategy(SpiderStrategy):
         """Get allowed domains for STF spider"""
         return ["portal.stf.jus.br"]
 
-    def validate_inputs(self, classe: str, processos: str) -> None:
+    def validate_inputs(self, classe: str, processos: str | list[int]) -> None:
         """Validate inputs specific to STF spider"""
         from ..types import validate_case_type
 
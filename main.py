@@ -1,13 +1,13 @@
-import json
 import os
 from pathlib import Path
 from typing import List, Optional
 
 import typer
-from rich import print
+from rich.console import Console
 
-from judex.core import JudexScraper
-from judex.strategies import SpiderStrategyFactory
+# Shared console; styles are passed explicitly, so markup parsing is off
+# (and brackets in paths or error messages print verbatim)
+console = Console(markup=False, highlight=False)
 
 # Create Typer app
 app = typer.Typer(
@@ -20,10 +20,12 @@ app = typer.Typer(
 @app.command()
 def batedores():
     """Listar os batedores disponíveis"""
+    from judex.strategies import SpiderStrategyFactory
+
     strategies = SpiderStrategyFactory.list_strategies()
-    print("Batedores disponíveis:")
+    console.print("Batedores disponíveis:")
     for strategy in strategies:
-        print(f"  - {strategy}")
+        console.print(f"  - {strategy}")
 
 
 @app.command()
@@ -91,14 +93,14 @@ def scrape(
     ),
 ):
     """Raspar casos jurídicos do STF"""
-    try:
-        # Convert process numbers to JSON string format expected by JudexScraper
-        processos_json = json.dumps(processo)
+    # JudexScraper pulls in Scrapy; only load it when a scrape actually runs
+    from judex.core import JudexScraper
 
+    try:
         # Create and run the scraper
         scraper = JudexScraper(
             classe=classe,
-            processos=processos_json,
+            processos=processo,
             scraper_kind=scraper_kind,
             output_path=str(output_path),
             salvar_como=salvar_como,  # Already a list
@@ -123,11 +125,12 @@ def scrape(
             scraper.settings.set("HTTPCACHE_ENABLED", False)
 
         # Display startup information with rich formatting
-        print(
-            f"[bold green]🚀 Iniciando raspador para classe '{classe}' com processo {processo}[/bold green]"
+        console.print(
+            f"🚀 Iniciando raspador para classe '{classe}' com processo {processo}",
+            style="bold green",
         )
-        print(f"[blue]📁 Diretório de saída: {output_path}[/blue]")
-        print(f"[blue]💾 Tipo de saída: {salvar_como}[/blue]")
+        console.print(f"📁 Diretório de saída: {output_path}", style="blue")
+        console.print(f"💾 Tipo de saída: {salvar_como}", style="blue")
 
         scraper.scrape()
 
@@ -135,7 +138,7 @@ def scrape(
         _log_saved_files(output_path, classe, custom_name, processo, salvar_como)
 
     except Exception as e:
-        print(f"[bold red]❌ Erro: {e}[/bold red]")
+        console.print(f"❌ Erro: {e}", style="bold red")
         raise typer.Exit(1)
 
 
@@ -149,9 +152,10 @@ def _log_saved_files(
     """Log the paths to saved files after scraping is complete"""
     from judex.output_registry import OutputFormatRegistry
 
-    print("\n[bold green]✅ Raspagem concluída! Arquivos salvos em:[/bold green]")
+    console.print("\n✅ Raspagem concluída! Arquivos salvos em:", style="bold green")
 
-    for format_name in salvar_como:
+    # Repeated formats (e.g. "-s json -s json") map to the same file
+    for format_name in dict.fromkeys(salvar_como):
         config = OutputFormatRegistry.get_pipeline_config(
             format_name=format_name,
             output_path=str(output_path),
@@ -163,19 +167,26 @@ def _log_saved_files(
 
         if config and "file_path" in config:
             file_path = config["file_path"]
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-                print(f"[green]  📄 {file_path} ({file_size:,} bytes)[/green]")
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                console.print(
+                    f"  ⚠️  {file_path} (arquivo não encontrado)", style="yellow"
+                )
             else:
-                print(f"[yellow]  ⚠️  {file_path} (arquivo não encontrado)[/yellow]")
+                console.print(f"  📄 {file_path} ({file_size:,} bytes)", style="green")
         elif format_name == "sql":
             # Special case for SQL - database file path
-            db_path = os.path.join(output_path, "judex.db")
-            if os.path.exists(db_path):
-                file_size = os.path.getsize(db_path) / (1024 * 1024)  # Convert bytes to MB
-                print(f"[green]  🗄️  {db_path} ({file_size:.2f} MB)[/green]")
+            db_path = output_path / "judex.db"
+            try:
+                # Convert bytes to MB
+                file_size = os.stat(db_path).st_size / (1024 * 1024)
+            except FileNotFoundError:
+                console.print(
+                    f"  ⚠️  {db_path} (arquivo não encontrado)", style="yellow"
+                )
             else:
-                print(f"[yellow]  ⚠️  {db_path} (arquivo não encontrado)[/yellow]")
+                console.print(f"  🗄️  {db_path} ({file_size:.2f} MB)", style="green")
 
 
 if __name__ == "__main__":
@@ -6,101 +6,224 @@ of the AI output JSON.
 
 import json
 import re
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
+try:
+    import orjson
+except ImportError:  # optional C parser; stdlib json works too
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional streaming parser; falls back to a full load
+    ijson = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional multi-pattern matcher; plain `in` is the fallback
+    ahocorasick = None
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml ships with scrapy; regex stripping is the fallback
+    lxml_html = None
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+# Values shorter than this are matched as whole words, not substrings
+SHORT_VALUE_LENGTH = 4
+
+# Numeric values are matched as whole words too, so "123" does not hit "12345"
+_NUMBER_RE = re.compile(r"[-+]?\d+(?:\.\d+)?(?:e[-+]?\d+)?")
+
+# Number of found/missing values kept in the results for display
+SAMPLE_SIZE = 10
+
+
+def load_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is available."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_first_case(path: str) -> Dict[str, Any]:
+    """Load the first case of a JSON array file without parsing the rest."""
+    if ijson is not None:
+        try:
+            with open(path, "rb") as f:
+                case = next(ijson.items(f, "item", use_float=True), None)
+        except ijson.JSONError:
+            # ijson errors carry no position; the full parse below re-raises
+            # the problem as a JSONDecodeError with line and column
+            pass
+        else:
+            if case is None:
+                raise ValueError(f"{path} contains no cases")
+            return case
+
+    cases = load_json(path)
+    if not cases:
+        raise ValueError(f"{path} contains no cases")
+    return cases[0]
+
 
 def extract_text_from_html(html_content: str) -> str:
     """Extract text content from HTML, removing tags and normalizing whitespace."""
     if not html_content:
         return ""
 
+    if lxml_html is not None:
+        try:
+            root = lxml_html.fromstring(html_content)
+        except etree.ParserError:  # whitespace-only document
+            return ""
+        # Tags act as word separators, like the regex path below
+        return " ".join(" ".join(root.itertext()).split())
+
     # Remove HTML tags
-    text = re.sub(r"<[^>]+>", " ", html_content)
+    text = _TAG_RE.sub(" ", html_content)
     # Normalize whitespace
-    text = re.sub(r"\s+", " ", text)
+    text = _WS_RE.sub(" ", text)
     # Remove extra spaces
     text = text.strip()
     return text
 
 
-def extract_field_values(data: Dict[str, Any], prefix: str = "") -> Set[str]:
-    """Recursively extract all string values from a JSON structure."""
+def extract_field_values(data: Dict[str, Any]) -> Set[str]:
+    """Collect all non-empty string and number values from a JSON structure."""
     values = set()
+    stack: List[Any] = [data]
 
-    for key, value in data.items():
-        if isinstance(value, str):
-            if value.strip():  # Only add non-empty strings
-                values.add(value.strip())
-        elif isinstance(value, (int, float)):
-            values.add(str(value))
-        elif isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    values.update(extract_field_values(item, f"{prefix}.{key}"))
-                elif isinstance(item, str) and item.strip():
-                    values.add(item.strip())
-                elif isinstance(item, (int, float)):
-                    values.add(str(item))
-        elif isinstance(value, dict):
-            values.update(extract_field_values(value, f"{prefix}.{key}"))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str):
+            stripped = node.strip()
+            if stripped:  # Only add non-empty strings
+                values.add(stripped)
+        elif isinstance(node, (int, float)):
+            values.add(str(node))
 
     return values
 
 
-def test_fields_in_html(ground_truth_path: str, ai_output_path: str) -> Dict[str, Any]:
-    """Test if all ground truth field values are present in the AI output HTML."""
+def find_whole_word_values(needles: Set[str], text_lower: str) -> Set[str]:
+    """Return the needles that appear in text_lower as whole words."""
+    found: Set[str] = set()
+    remaining = set(needles)
+    # Alternatives matching at the same spot shadow each other, so rescan
+    # without the ones already found until a pass adds nothing
+    while remaining:
+        alternatives = sorted(remaining, key=len, reverse=True)
+        pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(map(re.escape, alternatives)) + r")(?!\w)"
+        )
+        hits = remaining.intersection(pattern.findall(text_lower))
+        if not hits:
+            break
+        found |= hits
+        remaining -= hits
+    return found
 
-    # Load ground truth data
-    with open(ground_truth_path, "r", encoding="utf-8") as f:
-        gt_data = json.load(f)[0]  # Get first (and only) case
 
-    # Load AI output data with error handling
-    try:
-        with open(ai_output_path, "r", encoding="utf-8") as f:
-            ai_data = json.load(f)[0]  # Get first (and only) case
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing error: {e}")
-        print(f"Error at line {e.lineno}, column {e.colno}")
-        # Try to read the file content around the error
-        with open(ai_output_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            if e.lineno <= len(lines):
-                print(f"Problematic line: {repr(lines[e.lineno-1])}")
-                if e.lineno > 1:
-                    print(f"Previous line: {repr(lines[e.lineno-2])}")
-                if e.lineno < len(lines):
-                    print(f"Next line: {repr(lines[e.lineno])}")
-        raise
-
-    # Extract HTML content
-    html_content = ai_data.get("html", "")
-    html_text = extract_text_from_html(html_content)
+def find_values_in_text(values: Set[str], text: str) -> Set[str]:
+    """Return the subset of values that appear in text (case-insensitive)."""
+    text_lower = text.lower()
+
+    # Lowercase each value once; several values may share the same form
+    by_lower: Dict[str, List[str]] = {}
+    for value in values:
+        by_lower.setdefault(value.lower(), []).append(value)
+
+    # Short values such as "1" or "AI" and numbers such as "123" match
+    # inside unrelated words or longer numbers, so they must appear as whole
+    # words; only the remaining values are scanned as substrings
+    word_needles: Set[str] = set()
+    long_needles: List[str] = []
+    for needle in by_lower:
+        if len(needle) < SHORT_VALUE_LENGTH or _NUMBER_RE.fullmatch(needle):
+            word_needles.add(needle)
+        else:
+            long_needles.append(needle)
+
+    found: Set[str] = set()
+    for needle in find_whole_word_values(word_needles, text_lower):
+        found.update(by_lower[needle])
+
+    if not long_needles:
+        return found
+
+    if ahocorasick is None:
+        # bytes containment runs CPython's C fast search over a compact
+        # UTF-8 buffer; UTF-8 keeps substring matches identical to str
+        haystack = text_lower.encode("utf-8")
+        for needle in long_needles:
+            if needle.encode("utf-8") in haystack:
+                found.update(by_lower[needle])
+        return found
+
+    # One pass over the text matches every needle at once
+    automaton = ahocorasick.Automaton()
+    for needle in long_needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+
+    for _, needle in automaton.iter(text_lower):
+        found.update(by_lower[needle])
+    return found
+
+
+def test_fields_in_html(
+    gt_data: Dict[str, Any], ai_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Test if all ground truth field values are present in the AI output HTML."""
+    html_content = ai_data.get("html") or ""
+
+    # Use pre-stripped text when the output carries it; otherwise strip tags
+    html_text = ai_data.get("text")
+    if html_text is None:
+        html_text = extract_text_from_html(html_content)
 
     # Extract all field values from ground truth
     gt_values = extract_field_values(gt_data)
 
-    # Test each value
-    results = {
+    found = find_values_in_text(gt_values, html_text)
+    missing = gt_values - found
+
+    # Only a bounded sample of each side is kept for the report
+    return {
         "total_fields": len(gt_values),
-        "found_in_html": 0,
-        "missing_from_html": 0,
-        "found_values": [],
-        "missing_values": [],
+        "found_in_html": len(found),
+        "missing_from_html": len(missing),
+        "found_values": list(islice(found, SAMPLE_SIZE)),
+        "missing_values": list(islice(missing, SAMPLE_SIZE)),
         "html_length": len(html_content),
         "html_text_length": len(html_text),
     }
 
-    for value in gt_values:
-        # Check if value appears in HTML text (case-insensitive)
-        if value.lower() in html_text.lower():
-            results["found_in_html"] += 1
-            results["found_values"].append(value)
-        else:
-            results["missing_from_html"] += 1
-            results["missing_values"].append(value)
 
-    return results
+def print_json_error_context(path: str, e: json.JSONDecodeError) -> None:
+    """Print the lines around a JSON parsing error."""
+    print(f"JSON parsing error: {e}")
+    print(f"Error at line {e.lineno}, column {e.colno}")
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+        if e.lineno <= len(lines):
+            print(f"Problematic line: {repr(lines[e.lineno-1])}")
+            if e.lineno > 1:
+                print(f"Previous line: {repr(lines[e.lineno-2])}")
+            if e.lineno < len(lines):
+                print(f"Next line: {repr(lines[e.lineno])}")
 
 
 def main():
@@ -114,16 +237,18 @@ def main():
     try:
         # Test file loading first
         print("Loading ground truth file...")
-        with open(ground_truth_path, "r", encoding="utf-8") as f:
-            gt_data = json.load(f)[0]
+        gt_data = load_first_case(ground_truth_path)
         print("✓ Ground truth loaded successfully")
 
         print("Loading AI output file...")
-        with open(ai_output_path, "r", encoding="utf-8") as f:
-            ai_data = json.load(f)[0]
+        try:
+            ai_data = load_first_case(ai_output_path)
+        except json.JSONDecodeError as e:
+            print_json_error_context(ai_output_path, e)
+            raise
         print("✓ AI output loaded successfully")
 
-        results = test_fields_in_html(ground_truth_path, ai_output_path)
+        results = test_fields_in_html(gt_data, ai_data)
 
         print(f"Total fields in ground truth: {results['total_fields']}")
         print(f"Fields found in HTML: {results['found_in_html']}")
@@ -140,24 +265,28 @@ def main():
 
         if results["missing_values"]:
             print("Missing values:")
-            for value in results["missing_values"][:10]:  # Show first 10
+            for value in results["missing_values"]:
                 print(f"  - {value}")
-            if len(results["missing_values"]) > 10:
-                print(f"  ... and {len(results['missing_values']) - 10} more")
+            if results["missing_from_html"] > len(results["missing_values"]):
+                extra = results["missing_from_html"] - len(results["missing_values"])
+                print(f"  ... and {extra} more")
 
         print()
         if results["found_values"]:
-            print("Found values (first 10):")
-            for value in results["found_values"][:10]:
+            print(f"Found values (first {SAMPLE_SIZE}):")
+            for value in results["found_values"]:
                 print(f"  + {value}")
-            if len(results["found_values"]) > 10:
-                print(f"  ... and {len(results['found_values']) - 10} more")
+            if results["found_in_html"] > len(results["found_values"]):
+                extra = results["found_in_html"] - len(results["found_values"])
+                print(f"  ... and {extra} more")
 
     except FileNotFoundError as e:
         print(f"Error: Could not find file - {e}")
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON - {e}")
         print(f"Line: {e.lineno}, Column: {e.colno}")
+    except ValueError as e:
+        print(f"Error: {e}")
     except Exception as e:
         print(f"Error: {e}")
         import traceback
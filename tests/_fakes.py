@@ -0,0 +1,73 @@
+"""
+Lightweight test doubles for the judex test suite
+"""
+
+from types import SimpleNamespace
+from typing import Any
+
+from selenium.common.exceptions import NoSuchElementException
+
+
+class FakeSettings:
+    """Dict-backed stand-in for Scrapy's Settings"""
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+
+    def set(self, name: str, value: Any) -> None:
+        self.values[name] = value
+
+
+class FakeScraper:
+    """Stand-in for JudexScraper that records how it was built and run"""
+
+    # Reset to a fresh list per test by the fake_scraper_class fixture
+    instances: list["FakeScraper"] = []
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self.settings = FakeSettings()
+        self.scrape_calls = 0
+        type(self).instances.append(self)
+
+    def scrape(self) -> None:
+        self.scrape_calls += 1
+
+
+class FakeElement:
+    """Stand-in for a Selenium WebElement with fixed attributes"""
+
+    def __init__(self, text: str = "", **attributes: str) -> None:
+        self.text = text
+        self.attributes = attributes
+
+    def get_attribute(self, name: str) -> str | None:
+        return self.attributes.get(name)
+
+
+class FakeDriver:
+    """Stand-in for a Selenium WebDriver serving a page source and elements"""
+
+    def __init__(
+        self, page_source: str, elements: dict[str, FakeElement] | None = None
+    ) -> None:
+        self.page_source = page_source
+        self.elements = elements or {}
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        try:
+            return self.elements[value]
+        except KeyError:
+            raise NoSuchElementException(f"{by}={value}") from None
+
+
+def fake_selenium_response(
+    driver: FakeDriver, numero: int = 123, status: int = 200
+) -> SimpleNamespace:
+    """Response carrying the driver in request.meta, as scrapy-selenium does"""
+    return SimpleNamespace(
+        url=f"https://portal.stf.jus.br/processos/{numero}",
+        meta={"numero": numero},
+        status=status,
+        request=SimpleNamespace(meta={"driver": driver}),
+    )
@@ -0,0 +1,12 @@
+"""
+JSON decoding for tests that read back output files
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional C parser; stdlib json works too
+    orjson = None
+
+loads = orjson.loads if orjson is not None else json.loads
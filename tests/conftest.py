@@ -0,0 +1,39 @@
+"""
+Shared pytest configuration for the judex test suite
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# tmpfs on Linux, so tests that really write files skip the disk
+_RAMDISK = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-e2e",
+        action="store_true",
+        default=False,
+        help="run end-to-end tests that scrape the live STF portal",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip e2e tests unless --run-e2e is given"""
+    if config.getoption("--run-e2e"):
+        return
+
+    skip_e2e = pytest.mark.skip(reason="needs --run-e2e")
+    for item in items:
+        if "e2e" in item.keywords:
+            item.add_marker(skip_e2e)
+
+
+@pytest.fixture
+def ramdisk_tmp_path():
+    """Per-test directory on tmpfs when available, else the system temp dir"""
+    with tempfile.TemporaryDirectory(dir=_RAMDISK) as tmp_dir:
+        yield Path(tmp_dir)
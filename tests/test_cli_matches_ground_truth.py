@@ -1,39 +1,146 @@
-import json
+import functools
 import os
 import subprocess
-import tempfile
-from pathlib import Path
+import sys
 
 import pytest
 
-IGNORED_KEYS = {"extraido", "html", "status", "recursos"}
+from tests._json_fast import loads
 
+IGNORED_KEYS = frozenset({"extraido", "html", "status", "recursos"})
 
-def _assert_json_equal(expected, actual, path: str = "") -> None:
-    if isinstance(expected, dict) and isinstance(actual, dict):
-        expected_keys = set(k for k in expected.keys() if k not in IGNORED_KEYS)
-        actual_keys = set(actual.keys())
-        missing_keys = expected_keys - actual_keys
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-        assert not missing_keys, f"Missing keys at '{path}': {sorted(missing_keys)}"
 
-        for key in sorted(expected_keys):
-            next_path = f"{path}.{key}" if path else key
-            _assert_json_equal(expected[key], actual[key], next_path)
-        return
+def _format_path(node) -> str:
+    """Render a (parent, key) path chain as 'a.b[0].c'"""
+    parts = []
+    while node is not None:
+        node, key = node
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    path = "".join(reversed(parts))
+    return path[1:] if path.startswith(".") else path
 
-    if isinstance(expected, list) and isinstance(actual, list):
-        assert len(expected) == len(
-            actual
-        ), f"List length mismatch at '{path}': {len(expected)} != {len(actual)}"
 
-        for index, (exp_item, act_item) in enumerate(zip(expected, actual)):
-            _assert_json_equal(exp_item, act_item, f"{path}[{index}]")
-        return
+# id(root) -> (root, ids of its containers holding no IGNORED_KEYS); the
+# root is kept so its id cannot be reused while the entry exists
+_clean_ids_cache = {}
 
-    assert (
-        expected == actual
-    ), f"Value mismatch at '{path}': expected {expected!r}, got {actual!r}"
+
+def _clean_container_ids(root) -> set:
+    """Ids of the dicts/lists in root whose subtree has no ignored key"""
+    cached = _clean_ids_cache.get(id(root))
+    if cached is not None and cached[0] is root:
+        return cached[1]
+
+    clean, dirty = set(), set()
+    # Post-order: a container is decided after all of its children
+    stack = [(root, False)]
+    while stack:
+        obj, children_done = stack.pop()
+        if isinstance(obj, dict):
+            children = obj.values()
+        elif isinstance(obj, list):
+            children = obj
+        else:
+            continue
+
+        if not children_done:
+            stack.append((obj, True))
+            stack.extend((child, False) for child in children)
+        elif (isinstance(obj, dict) and not IGNORED_KEYS.isdisjoint(obj)) or any(
+            id(child) in dirty for child in children
+        ):
+            dirty.add(id(obj))
+        else:
+            clean.add(id(obj))
+
+    _clean_ids_cache[id(root)] = (root, clean)
+    return clean
+
+
+def _assert_json_equal(expected, actual) -> None:
+    clean = _clean_container_ids(expected)
+
+    # Walk with an explicit stack; paths are kept as (parent, key) links
+    # and only rendered into strings when an assertion fails
+    stack = [(expected, actual, None)]
+    while stack:
+        expected, actual, node = stack.pop()
+
+        # Subtrees without ignored keys are compared natively in one go; on
+        # a mismatch the walk below pinpoints the difference
+        if id(expected) in clean and expected == actual:
+            continue
+
+        if isinstance(expected, dict) and isinstance(actual, dict):
+            expected_keys = expected.keys() - IGNORED_KEYS
+            missing_keys = expected_keys - actual.keys()
+
+            assert (
+                not missing_keys
+            ), f"Missing keys at '{_format_path(node)}': {sorted(missing_keys)}"
+
+            # Reversed so keys are checked in sorted order as they are popped
+            for key in sorted(expected_keys, reverse=True):
+                stack.append((expected[key], actual[key], (node, key)))
+            continue
+
+        if isinstance(expected, list) and isinstance(actual, list):
+            assert len(expected) == len(actual), (
+                f"List length mismatch at '{_format_path(node)}': "
+                f"{len(expected)} != {len(actual)}"
+            )
+
+            for index in range(len(expected) - 1, -1, -1):
+                stack.append((expected[index], actual[index], (node, index)))
+            continue
+
+        assert expected == actual, (
+            f"Value mismatch at '{_format_path(node)}': "
+            f"expected {expected!r}, got {actual!r}"
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def _load_ground_truth(path: str):
+    """Parse a ground-truth file once per test session"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def run_judex(classe: str, processo: int, outdir: str) -> subprocess.CompletedProcess:
+    """Run the judex CLI with the test interpreter, in a fresh process"""
+    # Twisted's reactor cannot be restarted, so each scrape needs its own
+    # process; running main directly skips `uv run` resolution per case
+    cmd = [
+        sys.executable,
+        "-m",
+        "main",
+        "scrape",
+        "-c",
+        classe,
+        "-p",
+        str(processo),
+        "-s",
+        "json",
+        "--output-path",
+        outdir,
+    ]
+    # Output stays as bytes; it is only decoded for a failure message
+    return subprocess.run(
+        cmd,
+        capture_output=True,
+        cwd=REPO_ROOT,
+        timeout=180,
+    )
+
+
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """One output directory for all cases; file names are per case"""
+    # tmp_path_factory gives each xdist worker its own base directory
+    return tmp_path_factory.mktemp("judex_out")
 
 
 @pytest.mark.e2e
@@ -45,42 +152,24 @@ def _assert_json_equal(expected, actual, path: str = "") -> None:
         ("MI", 12, "tests/ground_truth/MI_12.json"),
     ],
 )
-def test_cli_output_matches_ground_truth(classe, processo, ground_truth_filename):
-    with tempfile.TemporaryDirectory() as tmpdir:
-        out_path = Path(tmpdir) / f"{classe}_{processo}.json"
-
-        cmd = [
-            "uv",
-            "run",
-            "judex",
-            "scrape",
-            "-c",
-            classe,
-            "-p",
-            str(processo),
-            "-s",
-            "json",
-            "--output-path",
-            tmpdir,
-        ]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            timeout=180,
-        )
-        assert (
-            result.returncode == 0
-        ), f"CLI failed: {result.stderr}\nSTDOUT:\n{result.stdout}"
+def test_cli_output_matches_ground_truth(
+    classe, processo, ground_truth_filename, shared_tmp
+):
+    out_path = shared_tmp / f"{classe}_{processo}.json"
+    # Never compare against a file left over from an earlier case
+    out_path.unlink(missing_ok=True)
+
+    result = run_judex(classe, processo, str(shared_tmp))
+    assert result.returncode == 0, (
+        f"CLI failed: {result.stderr.decode('utf-8', 'replace')}\n"
+        f"STDOUT:\n{result.stdout.decode('utf-8', 'replace')}"
+    )
 
-        # Load actual and expected JSON
-        assert out_path.exists(), f"Expected output file {out_path} not found"
-        with open(out_path, "r", encoding="utf-8") as f:
-            actual = json.load(f)
+    # Load actual and expected JSON
+    assert out_path.exists(), f"Expected output file {out_path} not found"
+    actual = loads(out_path.read_bytes())
 
-        with open(ground_truth_filename, "r", encoding="utf-8") as f:
-            expected = json.load(f)
+    expected = _load_ground_truth(ground_truth_filename)
 
-        # Deep, recursive structural equality with clear diffs
-        _assert_json_equal(expected, actual)
+    # Deep, recursive structural equality with clear diffs
+    _assert_json_equal(expected, actual)
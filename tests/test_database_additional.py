@@ -3,9 +3,7 @@ Additional database tests to verify functionality not covered in existing tests.
 """
 
 import importlib.util
-import os
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -30,20 +28,15 @@ processo_read_all = database.processo_read_all
 has_recent_data = database.has_recent_data
 get_existing_processo_ids = database.get_existing_processo_ids
 get_failed_processo_ids = database.get_failed_processo_ids
+get_processo_states = database.get_processo_states
 
 
 @pytest.fixture
-def temp_db():
+def temp_db(ramdisk_tmp_path):
     """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
-        db_path = tmp_file.name
-
+    db_path = str(ramdisk_tmp_path / "test.db")
     init_database(db_path)
-    yield db_path
-
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    return db_path
 
 
 @pytest.fixture
@@ -320,6 +313,24 @@ class TestFailedProcessoIds:
         result = get_failed_processo_ids(temp_db, "ADPF", 24)
         assert result == set()
 
+    def test_get_processo_states(self, temp_db, sample_processo_data):
+        """Test get_processo_states splits existing and failed in one call."""
+        processo_write(temp_db, sample_processo_data)
+        failed_data = sample_processo_data.copy()
+        failed_data["numero_unico"] = "0000001-00.0000.0.00.0000"
+        failed_data["incidente"] = 1
+        failed_data["processo_id"] = 1
+        processo_write(temp_db, failed_data)
+        mark_error(temp_db, failed_data["numero_unico"], "Test error")
+
+        classe = sample_processo_data["classe"]
+        existing, failed = get_processo_states(temp_db, classe, 24)
+
+        assert existing == get_existing_processo_ids(temp_db, classe, 24)
+        assert failed == get_failed_processo_ids(temp_db, classe, 24)
+        assert existing == {sample_processo_data["processo_id"]}
+        assert failed == {1}
+
 
 class TestDatabaseConstraints:
     """Test database constraints and validation."""
@@ -5,7 +5,6 @@ Standalone unit tests for the normalized database structure.
 import importlib.util
 import os
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -36,17 +35,11 @@ get_processo_pautas = database.get_processo_pautas
 
 
 @pytest.fixture
-def temp_db():
+def temp_db(ramdisk_tmp_path):
     """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
-        db_path = tmp_file.name
-
+    db_path = str(ramdisk_tmp_path / "test.db")
     init_database(db_path)
-    yield db_path
-
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    return db_path
 
 
 @pytest.fixture
@@ -327,6 +320,28 @@ class TestEdgeCases:
         assert len(complete_data["andamentos"]) == 0
         assert len(complete_data["decisoes"]) == 0
 
+    def test_many_andamentos(self, temp_db, sample_processo_data):
+        """Test bulk insertion of a long andamentos history."""
+        sample_processo_data["andamentos"] = [
+            {
+                "index": i,
+                "data": "01/01/2020",
+                "nome": f"Andamento {i}",
+                "complemento": None,
+                "julgador": None,
+            }
+            for i in range(1, 5001)
+        ]
+
+        assert processo_write(temp_db, sample_processo_data) is True
+
+        andamentos = get_processo_andamentos(
+            temp_db, sample_processo_data["numero_unico"]
+        )
+        assert len(andamentos) == 5000
+        assert andamentos[0]["index_num"] == 5000
+        assert andamentos[-1]["nome"] == "Andamento 1"
+
     def test_unicode_data(self, temp_db):
         """Test handling of Unicode and special characters."""
         unicode_data = {
@@ -3,7 +3,6 @@ End-to-end tests for CLI functionality
 These tests actually run the CLI commands and verify real behavior
 """
 
-import json
 import os
 import subprocess
 import tempfile
@@ -11,6 +10,8 @@ from pathlib import Path
 
 import pytest
 
+from tests._json_fast import loads
+
 
 @pytest.mark.e2e
 class TestE2ECLI:
@@ -166,7 +167,7 @@ class TestE2ECLI:
 
         # Verify JSON file exists (some processes might not have data)
         with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = loads(f.read())
             # At least one process should have data, but we're lenient about which ones
             assert isinstance(data, list), "JSON file should contain a list"
 
@@ -349,7 +350,7 @@ class TestE2ECLIWithRealData:
         assert os.path.exists(json_file)
 
         with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = loads(f.read())
 
         # Verify data structure
         if data:  # If we got data
@@ -0,0 +1,50 @@
+"""
+Tests for the standalone export helpers
+"""
+
+import csv
+
+from judex.exporters import export_to_csv
+
+
+def _read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_export_list(ramdisk_tmp_path):
+    """Test exporting a list of dicts writes a header and one line per row"""
+    path = ramdisk_tmp_path / "out.csv"
+    data = [{"classe": "ADI", "numero": 1}, {"classe": "ADPF", "numero": 2}]
+
+    assert export_to_csv(data, str(path)) is True
+    assert _read_rows(path) == [["classe", "numero"], ["ADI", "1"], ["ADPF", "2"]]
+
+
+def test_export_generator(ramdisk_tmp_path):
+    """Test that a generator is streamed without being materialized first"""
+    path = ramdisk_tmp_path / "out.csv"
+    data = ({"numero": i} for i in range(1000))
+
+    assert export_to_csv(data, str(path)) is True
+    rows = _read_rows(path)
+    assert rows[0] == ["numero"]
+    assert len(rows) == 1001
+    assert rows[-1] == ["999"]
+
+
+def test_export_empty(ramdisk_tmp_path):
+    """Test that exporting no rows leaves an empty file"""
+    path = ramdisk_tmp_path / "out.csv"
+
+    assert export_to_csv([], str(path)) is True
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def test_export_inconsistent_keys(ramdisk_tmp_path):
+    """Test that rows are aligned to the first row's header"""
+    path = ramdisk_tmp_path / "out.csv"
+    data = [{"a": 1, "b": 2}, {"b": 3, "c": 4}]
+
+    assert export_to_csv(data, str(path)) is True
+    assert _read_rows(path) == [["a", "b"], ["1", "2"], ["", "3"]]
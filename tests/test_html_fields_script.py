@@ -0,0 +1,107 @@
+"""
+Tests for the root-level test_html_fields.py comparison script
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import test_html_fields as script
+
+GROUND_TRUTH = Path(__file__).parent / "ground_truth" / "AI_772309.json"
+
+
+@pytest.fixture(params=["ijson", "full"])
+def loader(request, monkeypatch):
+    """Run each loading test with and without the streaming parser"""
+    if request.param == "ijson":
+        if script.ijson is None:
+            pytest.skip("ijson not installed")
+    else:
+        monkeypatch.setattr(script, "ijson", None)
+    return script.load_first_case
+
+
+def test_load_first_case(loader, tmp_path):
+    """Test that only the first case of the array is returned"""
+    path = tmp_path / "cases.json"
+    path.write_text('[{"classe": "ADI"}, {"classe": "ADPF"}]', encoding="utf-8")
+
+    assert loader(str(path)) == {"classe": "ADI"}
+
+
+def test_load_first_case_empty_array(loader, tmp_path):
+    """Test that an empty array is an error, not an empty case"""
+    path = tmp_path / "cases.json"
+    path.write_text("[\n\n]", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="contains no cases"):
+        loader(str(path))
+
+
+def test_load_first_case_malformed(loader, tmp_path):
+    """Test that malformed input surfaces as a JSONDecodeError with a position"""
+    path = tmp_path / "cases.json"
+    path.write_text('[{"classe": "ADI",}]', encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError) as excinfo:
+        loader(str(path))
+    assert excinfo.value.lineno == 1
+
+
+@pytest.fixture(params=["ahocorasick", "bytes"])
+def find_values(request, monkeypatch):
+    """Run each matching test on the automaton and on the bytes fallback"""
+    if request.param == "ahocorasick":
+        if script.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        monkeypatch.setattr(script, "ahocorasick", None)
+    return script.find_values_in_text
+
+
+def test_overlapping_long_values(find_values):
+    """Test that values nested in or overlapping each other are all found"""
+    values = {"Supremo Tribunal", "Tribunal Federal", "Supremo Tribunal Federal"}
+    text = "Página do Supremo Tribunal Federal"
+
+    assert find_values(values, text) == values
+
+
+def test_overlapping_short_values(find_values):
+    """Test that short values starting at the same spot don't shadow each other"""
+    values = {"1", "1 2", "2"}
+
+    assert find_values(values, "itens 1 2") == values
+
+
+def test_short_values_match_whole_words(find_values):
+    """Test that short values only match as whole words, ignoring case"""
+    values = {"AI", "ADI", "STF"}
+    text = "main adicionado ai 772309 (stf)"
+
+    assert find_values(values, text) == {"AI", "STF"}
+
+
+def test_numeric_values_match_whole_numbers(find_values):
+    """Test that numbers don't match inside longer numbers or CSS units"""
+    values = {"123", "12345", "2023", "200", "1.5"}
+    text = "processo 12345 de 20230 com width:200px e fator 1.5"
+
+    assert find_values(values, text) == {"12345", "1.5"}
+
+
+def test_matching_paths_agree_on_ground_truth(monkeypatch):
+    """Test that the automaton and the bytes fallback find the same values"""
+    if script.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    case = script.load_first_case(str(GROUND_TRUTH))
+    values = script.extract_field_values(case)
+    text = script.extract_text_from_html(case["html"])
+
+    fast = script.find_values_in_text(values, text)
+    monkeypatch.setattr(script, "ahocorasick", None)
+
+    assert script.find_values_in_text(values, text) == fast
+    assert fast
@@ -27,7 +27,7 @@ class TestMinifyCLIOption:
 
     def test_minify_html_passed_to_scraper(self):
         """Test that minify_html option is passed to JudexScraper"""
-        with patch("main.JudexScraper") as mock_scraper_class:
+        with patch("judex.core.JudexScraper") as mock_scraper_class:
             mock_scraper = MagicMock()
             mock_scraper_class.return_value = mock_scraper
 
@@ -44,7 +44,7 @@ class TestMinifyCLIOption:
 
     def test_minify_html_defaults_to_false(self):
         """Test that minify_html defaults to False when not specified"""
-        with patch("main.JudexScraper") as mock_scraper_class:
+        with patch("judex.core.JudexScraper") as mock_scraper_class:
             mock_scraper = MagicMock()
             mock_scraper_class.return_value = mock_scraper
 
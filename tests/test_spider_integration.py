@@ -3,56 +3,105 @@ Unit tests for spider integration with Pydantic
 """
 
 import asyncio
-import os
-import tempfile
+import copy
+from types import MappingProxyType
 from unittest.mock import Mock, patch
 
 import pytest
-from scrapy.http import Response
+from selenium.common.exceptions import NoSuchElementException
 
 from judex.models import CaseType
-from judex.spiders.stf import StfSpider
+from judex.spiders.stf import _INCIDENTE_RE, StfSpider
+from tests._fakes import FakeDriver, FakeElement, fake_selenium_response
+
+
+@pytest.fixture(scope="session")
+def base_spider():
+    """Built once; tests work on copies so their overrides don't leak"""
+    return StfSpider(
+        classe="ADI",
+        processos="[123, 456]",
+        internal_delay=0.1,
+        skip_existing=False,
+        retry_failed=False,
+    )
+
+
+# Canned return values for every extractor the main-page parser calls; shared
+# read-only across tests, with record lists frozen as tuples
+_EXTRACTOR_RETURNS = MappingProxyType(
+    {
+        "extract_numero_unico": "ADI 123456",
+        "extract_classe": "ADI",
+        "extract_relator": "Ministro Silva",
+        "extract_meio": "ELETRONICO",
+        "extract_publicidade": "PUBLICO",
+        "extract_badges": ("Medida Liminar",),
+        "extract_origem": "STF",
+        "extract_data_protocolo": "2023-01-01",
+        "extract_orgao_origem": "STF",
+        "extract_numero_origem": (123456789,),
+        "extract_primeiro_autor": "João Silva",
+        "extract_assuntos": ("Direito Constitucional",),
+        "extract_partes": ({"index": 1, "tipo": "Autor", "nome": "João Silva"},),
+        "extract_andamentos": (
+            {"index_num": 1, "data": "2023-01-01", "nome": "Distribuição"},
+        ),
+        "extract_deslocamentos": ({"index_num": 1, "data_enviado": "2023-01-01"},),
+        "extract_peticoes": ({"index": 1, "data": "2023-01-01", "tipo": "Petição"},),
+        "extract_recursos": ({"index": 1, "data": "2023-01-01", "nome": "Recurso"},),
+        "extract_pautas": ({"index": 1, "data": "2023-01-01", "nome": "Julgamento"},),
+        "extract_sessao_virtual": ({"data": "2023-01-01", "tipo": "Plenário"},),
+        "extract_volumes_folhas_apensos": MappingProxyType(
+            {"volumes": 1, "folhas": 282, "apensos": 0}
+        ),
+    }
+)
+
+# Item field filled by each extractor; the counters extractor fills three
+_EXTRACTOR_FIELDS = {
+    name: name[len("extract_") :]
+    for name in _EXTRACTOR_RETURNS
+    if name != "extract_volumes_folhas_apensos"
+}
+
+_SUCCESS_PAGE = (
+    '<html><form><input type="hidden" id="incidente" value="456"></form></html>'
+)
 
 
 @pytest.mark.integration
 class TestStfSpiderIntegration:
     """Test StfSpider integration with Pydantic"""
 
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.spider = StfSpider(
-            classe="ADI",
-            processos="[123, 456]",
-            internal_delay=0.1,
-            skip_existing=False,
-            retry_failed=False,
-        )
-        # Use temporary database for testing
-        self.temp_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
-        self.temp_db.close()
-
-    def _run_async_start(self):
+    @pytest.fixture(autouse=True)
+    def _spider(self, base_spider, tmp_path):
+        """Give each test its own shallow copy of the shared spider"""
+        self.spider = copy.copy(base_spider)
+        self.db_path = str(tmp_path / "test.db")
+
+    def _run_async_start(self, spider):
         """Helper method to run the async start method"""
 
         async def collect_requests():
             requests = []
-            async for request in self.spider.start():
+            async for request in spider.start():
                 requests.append(request)
             return requests
 
         return asyncio.run(collect_requests())
 
-    def teardown_method(self):
-        """Clean up test fixtures"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
-
     def test_spider_initialization(self):
         """Test spider initialization with Pydantic integration"""
         assert self.spider.name == "stf"
         assert self.spider.classe == CaseType.ADI
         assert self.spider.numeros == [123, 456]
 
+    def test_spider_initialization_with_list(self):
+        """Test spider initialization with processos already given as a list"""
+        spider = StfSpider(classe="ADI", processos=[123, 456])
+        assert spider.numeros == [123, 456]
+
     def test_spider_initialization_invalid_classe(self):
         """Test spider initialization with invalid classe"""
         with pytest.raises(ValueError):
@@ -73,92 +122,55 @@ class TestStfSpiderIntegration:
         with pytest.raises(ValueError):
             StfSpider(classe="ADI", processos="invalid_json")
 
-    @patch("judex.spiders.stf.get_existing_processo_ids")
-    @patch("judex.spiders.stf.get_failed_processo_ids")
-    def test_start_requests_with_database_check(self, mock_failed, mock_existing):
+    @patch("judex.spiders.stf.get_processo_states")
+    def test_start_requests_with_database_check(self, mock_states):
         """Test start_requests with database checks"""
-        mock_existing.return_value = {123}
-        mock_failed.return_value = {456}
+        mock_states.return_value = ({123}, {456})
 
         # Create spider with database checks enabled
-        spider = StfSpider(
-            classe="ADI",
-            processos="[123, 456]",
-            skip_existing=True,
-            retry_failed=True,
-        )
-        spider.settings = {"DATABASE_PATH": self.temp_db.name}
-
-        # Run the async start method
-        async def collect_requests():
-            requests = []
-            async for request in spider.start():
-                requests.append(request)
-            return requests
+        spider = self.spider
+        spider.skip_existing = True
+        spider.retry_failed = True
+        spider.settings = {"DATABASE_PATH": self.db_path}
 
-        requests = asyncio.run(collect_requests())
+        requests = self._run_async_start(spider)
 
         # Should create requests for failed processes (456) but skip existing ones (123)
         assert len(requests) == 1
         assert requests[0].meta["numero"] == 456
 
-        # Check that database functions were called
-        mock_existing.assert_called_once()
-        mock_failed.assert_called_once()
+        # Existing and failed ids come from a single database query
+        mock_states.assert_called_once()
 
-    @patch("judex.spiders.stf.get_existing_processo_ids")
-    @patch("judex.spiders.stf.get_failed_processo_ids")
-    def test_start_requests_skip_existing(self, mock_failed, mock_existing):
+    @patch("judex.spiders.stf.get_processo_states")
+    def test_start_requests_skip_existing(self, mock_states):
         """Test start_requests with skip_existing=True"""
-        mock_existing.return_value = {123}
-        mock_failed.return_value = set()
+        mock_states.return_value = ({123}, set())
 
         # Create spider with skip_existing enabled
-        spider = StfSpider(
-            classe="ADI",
-            processos="[123, 456]",
-            skip_existing=True,
-            retry_failed=False,
-        )
-        spider.settings = {"DATABASE_PATH": self.temp_db.name}
-
-        # Run the async start method
-        async def collect_requests():
-            requests = []
-            async for request in spider.start():
-                requests.append(request)
-            return requests
+        spider = self.spider
+        spider.skip_existing = True
+        spider.retry_failed = False
+        spider.settings = {"DATABASE_PATH": self.db_path}
 
-        requests = asyncio.run(collect_requests())
+        requests = self._run_async_start(spider)
 
         # Should skip existing process 123
         assert len(requests) == 1
         assert requests[0].meta["numero"] == 456
 
-    @patch("judex.spiders.stf.get_existing_processo_ids")
-    @patch("judex.spiders.stf.get_failed_processo_ids")
-    def test_start_requests_retry_failed(self, mock_failed, mock_existing):
+    @patch("judex.spiders.stf.get_processo_states")
+    def test_start_requests_retry_failed(self, mock_states):
         """Test start_requests with retry_failed=True"""
-        mock_existing.return_value = set()
-        mock_failed.return_value = {123}
+        mock_states.return_value = (set(), {123})
 
         # Create spider with retry_failed enabled
-        spider = StfSpider(
-            classe="ADI",
-            processos="[123, 456]",
-            skip_existing=False,
-            retry_failed=True,
-        )
-        spider.settings = {"DATABASE_PATH": self.temp_db.name}
-
-        # Run the async start method
-        async def collect_requests():
-            requests = []
-            async for request in spider.start():
-                requests.append(request)
-            return requests
+        spider = self.spider
+        spider.skip_existing = False
+        spider.retry_failed = True
+        spider.settings = {"DATABASE_PATH": self.db_path}
 
-        requests = asyncio.run(collect_requests())
+        requests = self._run_async_start(spider)
 
         # Should retry failed process 123
         assert len(requests) == 2
@@ -182,220 +194,74 @@ class TestStfSpiderIntegration:
         result = self.spider.clean_text("   ")
         assert result is None
 
-    @patch("judex.spiders.stf.extract_numero_unico")
-    @patch("judex.spiders.stf.extract_classe")
-    @patch("judex.spiders.stf.extract_liminar")
-    @patch("judex.spiders.stf.extract_relator")
-    @patch("judex.spiders.stf.extract_tipo_processo")
-    @patch("judex.spiders.stf.extract_origem")
-    @patch("judex.spiders.stf.extract_data_protocolo")
-    @patch("judex.spiders.stf.extract_orgao_origem")
-    @patch("judex.spiders.stf.extract_primeiro_autor")
-    @patch("judex.spiders.stf.extract_assuntos")
-    @patch("judex.spiders.stf.extract_partes")
-    @patch("judex.spiders.stf.extract_andamentos")
-    @patch("judex.spiders.stf.extract_decisoes")
-    @patch("judex.spiders.stf.extract_deslocamentos")
-    @patch("judex.spiders.stf.extract_peticoes")
-    @patch("judex.spiders.stf.extract_recursos")
-    @patch("judex.spiders.stf.extract_pautas")
-    @patch("judex.spiders.stf.extract_sessao")
-    def test_parse_main_page_selenium_success(
-        self,
-        mock_sessao,
-        mock_pautas,
-        mock_recursos,
-        mock_peticoes,
-        mock_deslocamentos,
-        mock_decisoes,
-        mock_andamentos,
-        mock_partes,
-        mock_assuntos,
-        mock_primeiro_autor,
-        mock_orgao_origem,
-        mock_data_protocolo,
-        mock_origem,
-        mock_tipo_processo,
-        mock_relator,
-        mock_liminar,
-        mock_classe,
-        mock_numero_unico,
-    ):
+        # Plain text and entities
+        assert self.spider.clean_text("  Test \n text ") == "Test text"
+        assert self.spider.clean_text("Ação &amp; Cia") == "Ação & Cia"
+
+    @patch.multiple(
+        "judex.spiders.stf",
+        **{
+            name: Mock(return_value=value) for name, value in _EXTRACTOR_RETURNS.items()
+        },
+    )
+    def test_parse_main_page_selenium_success(self):
         """Test successful parsing of main page with all extractors"""
-        # Mock all extractors
-        mock_numero_unico.return_value = "ADI 123456"
-        mock_classe.return_value = "ADI"
-        mock_liminar.return_value = ["liminar1"]
-        mock_relator.return_value = "Ministro Silva"
-        mock_tipo_processo.return_value = "Eletrônico"
-        mock_origem.return_value = "STF"
-        mock_data_protocolo.return_value = "2023-01-01"
-        mock_orgao_origem.return_value = "STF"
-        mock_primeiro_autor.return_value = "João Silva"
-        mock_assuntos.return_value = ["Direito Constitucional"]
-        mock_partes.return_value = [
-            {"_index": 1, "tipo": "Autor", "nome": "João Silva"}
-        ]
-        mock_andamentos.return_value = [
-            {"index": 1, "data": "2023-01-01", "nome": "Distribuição"}
-        ]
-        mock_decisoes.return_value = [
-            {"index": 1, "data": "2023-01-01", "nome": "Decisão 1"}
-        ]
-        mock_deslocamentos.return_value = [{"index": 1, "data_enviado": "2023-01-01"}]
-        mock_peticoes.return_value = [
-            {"index": 1, "data": "2023-01-01", "tipo": "Petição"}
-        ]
-        mock_recursos.return_value = [
-            {"index": 1, "data": "2023-01-01", "nome": "Recurso"}
-        ]
-        mock_pautas.return_value = [
-            {"index": 1, "data": "2023-01-01", "nome": "Julgamento"}
-        ]
-        mock_sessao.return_value = {"data": "2023-01-01", "tipo": "Plenário"}
-
-        # Create mock response
-        mock_response = Mock(spec=Response)
-        mock_response.meta = {"numero": 123}
-        mock_response.status = 200
-
-        # Create mock driver
-        mock_driver = Mock()
-        mock_driver.page_source = "<html>Test page</html>"
-        mock_driver.find_element.return_value.text = "Test origem"
-
-        # Mock WebDriverWait
-        with patch("judex.spiders.stf.WebDriverWait") as mock_wait:
-            mock_wait.return_value.until.return_value = None
-
-            # Mock get_element_by_id
-            self.spider.get_element_by_id = Mock(return_value="456")
-
-            # Mock BeautifulSoup
-            with patch("judex.spiders.stf.BeautifulSoup") as mock_soup:
-                mock_soup.return_value = Mock()
-
-                # Mock request with driver
-                mock_request = Mock()
-                mock_request.meta = {"driver": mock_driver}
-                mock_response.request = mock_request
-
-                # Mock crawler for stats
-                mock_crawler = Mock()
-                mock_crawler.stats = Mock()
-                mock_crawler.stats.inc_value = Mock()
-                self.spider.crawler = mock_crawler
-
-                # Test parsing
-                items = list(self.spider.parse_main_page_selenium(mock_response))
-
-                # Should return one item
-                assert len(items) == 1
-                item = items[0]
-
-                # Check that item has expected fields
-                assert item["processo_id"] == 123
-                assert item["incidente"] == 456
-                assert item["numero_unico"] == "ADI 123456"
-                assert item["classe"] == "ADI"
-                assert item["liminar"] == ["liminar1"]
-                assert item["relator"] == "Ministro Silva"
-                assert item["tipo_processo"] == "Eletrônico"
-                assert item["origem"] == "STF"
-                assert item["data_protocolo"] == "2023-01-01"
-                assert item["orgao_origem"] == "STF"
-                assert item["primeiro_autor"] == "João Silva"
-                assert item["assuntos"] == ["Direito Constitucional"]
-                assert item["status"] == 200
-                assert item["html"] == "<html>Test page</html>"
-                assert "extraido" in item
-
-    def test_parse_main_page_selenium_captcha_detection(self):
-        """Test parsing with CAPTCHA detection"""
-        # Create mock response
-        mock_response = Mock(spec=Response)
-        mock_response.meta = {"numero": 123}
-
-        # Create mock driver with CAPTCHA
-        mock_driver = Mock()
-        mock_driver.page_source = "CAPTCHA detected"
-
-        # Mock request with driver
-        mock_request = Mock()
-        mock_request.meta = {"driver": mock_driver}
-        mock_response.request = mock_request
-
-        # Test parsing
-        items = list(self.spider.parse_main_page_selenium(mock_response))
-
-        # Should return no items due to CAPTCHA
-        assert len(items) == 0
-
-    def test_parse_main_page_selenium_403_forbidden(self):
-        """Test parsing with 403 Forbidden"""
-        # Create mock response
-        mock_response = Mock(spec=Response)
-        mock_response.meta = {"numero": 123}
-
-        # Create mock driver with 403
-        mock_driver = Mock()
-        mock_driver.page_source = "403 Forbidden"
-
-        # Mock request with driver
-        mock_request = Mock()
-        mock_request.meta = {"driver": mock_driver}
-        mock_response.request = mock_request
-
-        # Test parsing
-        items = list(self.spider.parse_main_page_selenium(mock_response))
-
-        # Should return no items due to 403
-        assert len(items) == 0
-
-    def test_parse_main_page_selenium_502_bad_gateway(self):
-        """Test parsing with 502 Bad Gateway"""
-        # Create mock response
-        mock_response = Mock(spec=Response)
-        mock_response.meta = {"numero": 123}
-
-        # Create mock driver with 502
-        mock_driver = Mock()
-        mock_driver.page_source = "502 Bad Gateway"
-
-        # Mock request with driver
-        mock_request = Mock()
-        mock_request.meta = {"driver": mock_driver}
-        mock_response.request = mock_request
-
-        # Test parsing
-        items = list(self.spider.parse_main_page_selenium(mock_response))
-
-        # Should return no items due to 502
+        # The partes block is already rendered, so the AJAX wait returns at once
+        resumo = FakeElement(innerHTML='<div class="processo-partes"></div>')
+        driver = FakeDriver(_SUCCESS_PAGE, elements={"resumo-partes": resumo})
+        response = fake_selenium_response(driver, numero=123)
+
+        items = list(self.spider.parse_main_page_selenium(response))
+
+        assert len(items) == 1
+        item = items[0]
+
+        assert item["processo_id"] == 123
+        assert item["incidente"] == 456
+        for name, field in _EXTRACTOR_FIELDS.items():
+            assert item[field] == _EXTRACTOR_RETURNS[name], field
+        assert item["volumes"] == 1
+        assert item["folhas"] == 282
+        assert item["apensos"] == 0
+        assert item["status"] == 200
+        assert item["html"] == _SUCCESS_PAGE
+        assert "extraido" in item
+
+    @pytest.mark.parametrize(
+        "page_source", ["CAPTCHA detected", "403 Forbidden", "502 Bad Gateway"]
+    )
+    def test_parse_main_page_selenium_error_page(self, page_source):
+        """Test parsing of CAPTCHA and HTTP error pages"""
+        response = fake_selenium_response(FakeDriver(page_source))
+
+        items = list(self.spider.parse_main_page_selenium(response))
+
+        # Should return no items for an error page
         assert len(items) == 0
 
     def test_parse_main_page_selenium_no_incidente(self):
         """Test parsing when incidente cannot be extracted"""
-        # Create mock response
-        mock_response = Mock(spec=Response)
-        mock_response.meta = {"numero": 123}
-
-        # Create mock driver
-        mock_driver = Mock()
-        mock_driver.page_source = "<html>Test page</html>"
-
-        # Mock request with driver
-        mock_request = Mock()
-        mock_request.meta = {"driver": mock_driver}
-        mock_response.request = mock_request
+        response = fake_selenium_response(FakeDriver("<html>Test page</html>"))
 
         # Mock get_element_by_id to return 0 (invalid incidente)
         self.spider.get_element_by_id = Mock(return_value="0")
 
         # Test parsing
-        items = list(self.spider.parse_main_page_selenium(mock_response))
+        with patch("judex.spiders.stf.BeautifulSoup") as mock_soup:
+            items = list(self.spider.parse_main_page_selenium(response))
 
-        # Should return no items due to invalid incidente
+        # Should return no items due to invalid incidente, without parsing
         assert len(items) == 0
+        mock_soup.assert_not_called()
+
+    def test_incidente_regex_reads_hidden_input(self):
+        """Test incidente is read from the raw page source"""
+        html = '<form><input type="hidden" id="incidente" value="4448416"></form>'
+        match = _INCIDENTE_RE.search(html)
+
+        assert match is not None
+        assert int(match.group(1)) == 4448416
+        assert _INCIDENTE_RE.search("<html>Test page</html>") is None
 
     def test_get_element_by_id(self):
         """Test get_element_by_id method"""
@@ -413,6 +279,22 @@ class TestStfSpiderIntegration:
 
             assert result == "test_value"
             mock_driver.find_element.assert_called_once_with("id", "test_id")
+            mock_wait.assert_not_called()
+
+    def test_get_element_by_id_waits_when_missing(self):
+        """Test get_element_by_id polls only when the element isn't there yet"""
+        mock_driver = Mock()
+        mock_driver.find_element.side_effect = NoSuchElementException()
+        mock_element = Mock()
+        mock_element.get_attribute.return_value = "test_value"
+
+        with patch("judex.spiders.stf.WebDriverWait") as mock_wait:
+            mock_wait.return_value.until.return_value = mock_element
+
+            result = self.spider.get_element_by_id(mock_driver, "test_id")
+
+            assert result == "test_value"
+            mock_wait.return_value.until.assert_called_once()
 
     def test_get_element_by_xpath(self):
         """Test get_element_by_xpath method"""